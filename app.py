@@ -2,11 +2,15 @@ import gradio as gr
 import os
 import re
 import time
+import math
+from modules import task_store
 from modules.script_generator import generate_script as sg_generate_script, generate_image_prompt, _initialize_llm as initialize_llm_model # 使用別名避免命名衝突
 from modules.tts_module import generate_tts_audio
+from modules.speech_duration import record_tts_output
 from modules.video_generator import generate_video as vg_generate_video # 使用別名避免命名衝突
+from modules.encoder_tuner import resolve_encode_profile
 from modules.image_generator import generate_background_image, initialize_image_model
-from config import TEMP_DIR, DEFAULT_BG_IMAGE, VIDEO_WIDTH, VIDEO_HEIGHT
+from config import TEMP_DIR, DEFAULT_BG_IMAGE, VIDEO_WIDTH, VIDEO_HEIGHT, TASK_PAGE_SIZE, DEFAULT_ENCODE_PROFILE
 
 # --- Helper Functions ---
 
@@ -18,20 +22,20 @@ def sanitize_filename(text: str) -> str:
 
 # --- Backend Logic Functions (Originals, mostly unchanged) ---
 
-def create_script(question, script_language):
+def create_script(question, script_language, tts_voice):
     """Generates a script from a question."""
     if not question or not question.strip():
         raise gr.Error("問題不能為空！")
     try:
         print(f"[SCRIPT] 正在為 '{question[:30]}...' 生成演講稿...")
-        script = sg_generate_script(question, language=script_language)
+        script = sg_generate_script(question, language=script_language, voice=tts_voice)
         print("[SCRIPT] 演講稿生成完畢。")
         return script
     except Exception as e:
         print(f"\n❌ [SCRIPT] 發生錯誤：{e}")
         raise gr.Error(f"生成演講稿時發生錯誤: {e}")
 
-def create_audio(script, tts_voice):
+def create_audio(script, tts_voice, script_language, record_calibration=True):
     """Generates audio from a script."""
     if not script or not script.strip():
         raise gr.Error("演講稿不能為空！請先生成或輸入演講稿。")
@@ -43,11 +47,18 @@ def create_audio(script, tts_voice):
         audio_path = os.path.join(TEMP_DIR, audio_filename)
         generate_tts_audio(script, audio_path, voice_name=tts_voice)
         print(f"[AUDIO] 語音生成完畢: {audio_path}")
-        return audio_path
     except Exception as e:
         print(f"\n❌ [AUDIO] 發生錯誤：{e}")
         raise gr.Error(f"生成語音時發生錯誤: {e}")
 
+    if record_calibration:
+        # 以實際的語音長度校正此語言與人聲的語速，供之後控制講稿長度；校正失敗不影響語音結果
+        try:
+            record_tts_output(script, script_language, tts_voice, audio_path)
+        except Exception as e:
+            print(f"[AUDIO] 語速校正失敗，已略過：{e}")
+    return audio_path
+
 def create_background_image(question, script, video_width, video_height):
     """Generates a background image from the script content."""
     if not script or not script.strip():
@@ -75,7 +86,7 @@ def create_background_image(question, script, video_width, video_height):
         error_message = f"生成背景圖片時發生錯誤: {e}\n\n提示：圖片生成功能 (Stable Diffusion) 非常耗費資源，建議在有 NVIDIA GPU 的環境下執行。若使用 CPU 可能會非常緩慢或因記憶體不足而失敗。"
         raise gr.Error(error_message)
 
-def create_video(audio_path, question, video_title, background_image, video_width, video_height, font_size, font_color, output_filename):
+def create_video(audio_path, question, video_title, background_image, video_width, video_height, font_size, font_color, output_filename, encode_profile, target_encode_speed, target_mb_per_minute):
     """Generates a video from audio and other settings."""
     if not audio_path or not os.path.exists(audio_path):
         raise gr.Error("找不到音訊檔案！請先生成語音。")
@@ -96,6 +107,14 @@ def create_video(audio_path, question, video_title, background_image, video_widt
                 a_int = int(a * 255)
                 ffmpeg_font_color = f"0x{r_int:02x}{g_int:02x}{b_int:02x}{a_int:02x}"
 
+        # 自動調校時，目標值為 0 表示不限制
+        encode_settings = resolve_encode_profile(
+            encode_profile, int(video_width), int(video_height),
+            target_speed=target_encode_speed or None,
+            target_mb_per_minute=target_mb_per_minute or None
+        )
+        print(f"[VIDEO] 使用編碼設定 ({encode_profile}): {encode_settings}")
+
         video_path = vg_generate_video(
             audio_path=audio_path,
             question_text=title_text,
@@ -104,7 +123,8 @@ def create_video(audio_path, question, video_title, background_image, video_widt
             width=int(video_width),
             height=int(video_height),
             font_size=int(font_size),
-            font_color=ffmpeg_font_color
+            font_color=ffmpeg_font_color,
+            encode_settings=encode_settings
         )
         
         print(f"\n✅ [VIDEO] 影片已成功生成：{video_path}")
@@ -115,8 +135,21 @@ def create_video(audio_path, question, video_title, background_image, video_widt
 
 # --- State Management and UI Functions ---
 
+def load_question_page(session_id, page, selected_question=None):
+    """依頁碼從任務資料庫載入一頁問題到下拉選單."""
+    total_tasks = task_store.count_tasks(session_id)
+    total_pages = max(1, math.ceil(total_tasks / TASK_PAGE_SIZE))
+    page = min(max(1, int(page or 1)), total_pages)
+    questions = task_store.list_questions(session_id, offset=(page - 1) * TASK_PAGE_SIZE, limit=TASK_PAGE_SIZE)
+    if selected_question not in questions:
+        selected_question = questions[0] if questions else None
+    return (
+        gr.update(value=page, label=f"頁碼 (共 {total_pages} 頁，{total_tasks} 個任務)"),
+        gr.update(choices=questions, value=selected_question)
+    )
+
 def parse_and_load_questions(questions_text):
-    """從輸入文字中解析問題並初始化任務狀態."""
+    """從輸入文字中解析問題，並在任務資料庫中建立新的工作階段."""
     question_blocks = re.split(r'\n\s*\n', questions_text.strip())
     questions = []
     for block in question_blocks:
@@ -128,59 +161,74 @@ def parse_and_load_questions(questions_text):
     if not questions:
         raise gr.Error("請輸入至少一個問題！")
 
-    tasks_state = {q: {
-        'script': '', 'audio_path': None, 'image_prompt': '',
-        'bg_image_path': None, 'video_path': None
-    } for q in questions}
+    session_id = task_store.create_session(questions)
     
     first_question = questions[0]
-    return tasks_state, gr.update(choices=questions, value=first_question), *update_ui_for_selected_question(first_question, tasks_state)
-
-def update_ui_for_selected_question(selected_question, tasks_state):
+    return session_id, *load_question_page(session_id, 1), *update_ui_for_selected_question(first_question, session_id)
+
+def restore_session(session_id):
+    """以先前的 session id 從任務資料庫恢復進度 (例如重新整理頁面後)."""
+    session_id = (session_id or "").strip()
+    if not task_store.count_tasks(session_id):
+        raise gr.Error("找不到此工作階段的任務，請確認 ID 是否正確！")
+    first_question = task_store.list_questions(session_id, limit=1)[0]
+    return session_id, *load_question_page(session_id, 1), *update_ui_for_selected_question(first_question, session_id)
+
+def restore_saved_session(saved_session_id):
+    """頁面載入時，以瀏覽器中保存的 session id 自動恢復進度 (找不到時保持空白)."""
+    if not task_store.count_tasks(saved_session_id):
+        return "", gr.update(), gr.update(), "", None, "", None, None
+    return restore_session(saved_session_id)
+
+def update_ui_for_selected_question(selected_question, session_id):
     """當使用者從下拉選單選擇不同問題時，更新 UI 介面."""
-    if not selected_question or selected_question not in tasks_state:
+    task_data = task_store.get_task(session_id, selected_question)
+    if task_data is None:
         return "", None, "", None, None
     
-    task_data = tasks_state.get(selected_question, {})
     return (
-        task_data.get('script', ''),
+        task_data.get('script') or '',
         task_data.get('audio_path'),
-        task_data.get('image_prompt', ''),
+        task_data.get('image_prompt') or '',
         task_data.get('bg_image_path'),
         task_data.get('video_path')
     )
 
+def _get_selected_task(selected_question, session_id):
+    """取得當前選擇的任務資料，找不到時拋出錯誤."""
+    if not selected_question: raise gr.Error("請先選擇一個任務！")
+    task_data = task_store.get_task(session_id, selected_question)
+    if task_data is None: raise gr.Error("找不到此任務，請重新載入問題或恢復工作階段！")
+    return task_data
+
 # --- New Wrapper Functions for Single-Step Execution ---
 
-def run_single_script_step(selected_question, tasks_state, script_language):
+def run_single_script_step(selected_question, session_id, script_language, tts_voice):
     """僅為當前選擇的任務生成演講稿。"""
-    if not selected_question: raise gr.Error("請先選擇一個任務！")
-    script = create_script(selected_question, script_language)
-    tasks_state[selected_question]['script'] = script
-    return tasks_state, script
+    _get_selected_task(selected_question, session_id)
+    script = create_script(selected_question, script_language, tts_voice)
+    task_store.update_task(session_id, selected_question, script=script)
+    return script
 
-def run_single_audio_step(selected_question, tasks_state, script_from_ui, tts_voice):
+def run_single_audio_step(selected_question, session_id, script_from_ui, tts_voice, script_language):
     """僅為當前選擇的任務生成語音。"""
-    if not selected_question: raise gr.Error("請先選擇一個任務！")
-    # 使用 UI 上可能已編輯過的腳本
-    audio_path = create_audio(script_from_ui, tts_voice)
-    tasks_state[selected_question]['audio_path'] = audio_path
-    tasks_state[selected_question]['script'] = script_from_ui # 同步更新狀態
-    return tasks_state, audio_path
-
-def run_single_image_step(selected_question, tasks_state, script_from_ui, video_width, video_height):
+    task_data = _get_selected_task(selected_question, session_id)
+    # 使用 UI 上可能已編輯過的腳本；手動編輯過的腳本不一定符合所選語言，不用於語速校正
+    is_generated_script = script_from_ui == task_data.get('script')
+    audio_path = create_audio(script_from_ui, tts_voice, script_language, record_calibration=is_generated_script)
+    task_store.update_task(session_id, selected_question, audio_path=audio_path, script=script_from_ui) # 同步更新狀態
+    return audio_path
+
+def run_single_image_step(selected_question, session_id, script_from_ui, video_width, video_height):
     """僅為當前選擇的任務生成 AI 背景圖。"""
-    if not selected_question: raise gr.Error("請先選擇一個任務！")
+    _get_selected_task(selected_question, session_id)
     image_prompt, image_path = create_background_image(selected_question, script_from_ui, video_width, video_height)
-    tasks_state[selected_question]['image_prompt'] = image_prompt
-    tasks_state[selected_question]['bg_image_path'] = image_path
-    return tasks_state, image_prompt, image_path
+    task_store.update_task(session_id, selected_question, image_prompt=image_prompt, bg_image_path=image_path)
+    return image_prompt, image_path
 
-def run_single_video_step(selected_question, tasks_state, background_image_upload, video_width, video_height, font_size, font_color, output_filename_prefix):
+def run_single_video_step(selected_question, session_id, background_image_upload, video_width, video_height, font_size, font_color, output_filename_prefix, encode_profile, target_encode_speed, target_mb_per_minute):
     """僅為當前選擇的任務合成影片。"""
-    if not selected_question: raise gr.Error("請先選擇一個任務！")
-    
-    task_data = tasks_state[selected_question]
+    task_data = _get_selected_task(selected_question, session_id)
     audio_path = task_data.get('audio_path')
     # 優先使用任務自己的背景圖，若無則使用通用上傳的背景圖
     bg_path = task_data.get('bg_image_path') or background_image_upload
@@ -190,65 +238,71 @@ def run_single_video_step(selected_question, tasks_state, background_image_uploa
     sanitized_q = sanitize_filename(selected_question)
     output_filename = f"{output_filename_prefix}_{sanitized_q}_single.mp4"
     
-    video_path = create_video(audio_path, selected_question, selected_question, bg_path, video_width, video_height, font_size, font_color, output_filename)
-    tasks_state[selected_question]['video_path'] = video_path
-    return tasks_state, video_path
+    video_path = create_video(audio_path, selected_question, selected_question, bg_path, video_width, video_height, font_size, font_color, output_filename, encode_profile, target_encode_speed, target_mb_per_minute)
+    task_store.update_task(session_id, selected_question, video_path=video_path)
+    return video_path
 
 # --- Full Pipeline Functions ---
 
-def run_single_pipeline_for_state(question, task_data, script_language, tts_voice, video_width, video_height, use_ai_image, background_image_upload, font_size, font_color, output_filename_prefix):
-    """為單一問題執行完整的影片生成流程並更新其狀態 (供批次處理呼叫)。"""
-    script = create_script(question, script_language)
-    task_data['script'] = script
-    audio_path = create_audio(script, tts_voice)
-    task_data['audio_path'] = audio_path
+def run_single_pipeline_for_task(question, session_id, script_language, tts_voice, video_width, video_height, use_ai_image, background_image_upload, font_size, font_color, output_filename_prefix, encode_profile, target_encode_speed, target_mb_per_minute):
+    """為單一問題執行完整的影片生成流程，並在每個步驟完成後寫回任務資料庫 (供批次處理呼叫)。"""
+    script = create_script(question, script_language, tts_voice)
+    task_store.update_task(session_id, question, script=script)
+    audio_path = create_audio(script, tts_voice, script_language)
+    task_store.update_task(session_id, question, audio_path=audio_path)
     
     final_bg_path = background_image_upload
     if use_ai_image:
         image_prompt, final_bg_path = create_background_image(question, script, video_width, video_height)
-        task_data['image_prompt'] = image_prompt
-        task_data['bg_image_path'] = final_bg_path
     else:
-        task_data['image_prompt'] = "未使用 AI 生成圖片"
-        task_data['bg_image_path'] = final_bg_path
+        image_prompt = "未使用 AI 生成圖片"
+    task_store.update_task(session_id, question, image_prompt=image_prompt, bg_image_path=final_bg_path)
     
     sanitized_q = sanitize_filename(question)
     output_filename = f"{output_filename_prefix}_{sanitized_q}.mp4"
-    video_path = create_video(audio_path, question, question, final_bg_path, video_width, video_height, font_size, font_color, output_filename)
-    task_data['video_path'] = video_path
-    return task_data
-
-def process_all_tasks(tasks_state, script_language, tts_voice, video_width, video_height, use_ai_image, background_image_upload, font_size, font_color, output_filename_prefix, progress=gr.Progress(track_tqdm=True)):
-    """為狀態中的所有任務執行整個影片生成流程."""
-    if not tasks_state: raise gr.Error("沒有已載入的任務！請先輸入問題並點擊 '解析並載入問題'。")
+    video_path = create_video(audio_path, question, question, final_bg_path, video_width, video_height, font_size, font_color, output_filename, encode_profile, target_encode_speed, target_mb_per_minute)
+    task_store.update_task(session_id, question, video_path=video_path)
+    return video_path
+
+def process_all_tasks(session_id, script_language, tts_voice, video_width, video_height, use_ai_image, background_image_upload, font_size, font_color, output_filename_prefix, encode_profile, target_encode_speed, target_mb_per_minute, progress=gr.Progress(track_tqdm=True)):
+    """為工作階段中的所有任務執行整個影片生成流程."""
+    total_questions = task_store.count_tasks(session_id)
+    if not total_questions: raise gr.Error("沒有已載入的任務！請先輸入問題並點擊 '解析並載入問題'。")
     
-    questions = list(tasks_state.keys())
-    total_questions = len(questions)
     all_video_paths = []
-
-    for i, question in enumerate(questions):
-        progress(i / total_questions, desc=f"[{i+1}/{total_questions}] 處理中: {question[:30]}...")
-        try:
-            updated_task_data = run_single_pipeline_for_state(
-                question, tasks_state[question], script_language, tts_voice, video_width, video_height,
-                use_ai_image, background_image_upload, font_size, font_color, output_filename_prefix
-            )
-            tasks_state[question] = updated_task_data
-            if updated_task_data.get('video_path'):
-                all_video_paths.append(updated_task_data['video_path'])
-        except Exception as e:
-            gr.Warning(f"處理問題 '{question}' 時發生錯誤: {e}")
-            continue
+    i = 0
+    # 逐頁從資料庫讀取問題，避免一次載入整個任務列表
+    for offset in range(0, total_questions, TASK_PAGE_SIZE):
+        for question in task_store.list_questions(session_id, offset=offset, limit=TASK_PAGE_SIZE):
+            progress(i / total_questions, desc=f"[{i+1}/{total_questions}] 處理中: {question[:30]}...")
+            i += 1
+            try:
+                video_path = run_single_pipeline_for_task(
+                    question, session_id, script_language, tts_voice, video_width, video_height,
+                    use_ai_image, background_image_upload, font_size, font_color, output_filename_prefix,
+                    encode_profile, target_encode_speed, target_mb_per_minute
+                )
+                if video_path:
+                    all_video_paths.append(video_path)
+            except Exception as e:
+                gr.Warning(f"處理問題 '{question}' 時發生錯誤: {e}")
+                continue
             
     progress(1.0, desc="全部處理完畢！")
 
-    last_question = questions[-1]
-    last_task_ui_updates = update_ui_for_selected_question(last_question, tasks_state)
-    return tasks_state, all_video_paths, gr.update(value=last_question), *last_task_ui_updates
+    last_questions = task_store.list_questions(session_id, offset=total_questions - 1, limit=1)
+    if not last_questions:
+        gr.Warning("此工作階段的任務已被清除，無法顯示處理結果。")
+        return all_video_paths, *load_question_page(session_id, 1), *update_ui_for_selected_question(None, session_id)
+    last_page = math.ceil(total_questions / TASK_PAGE_SIZE)
+    last_question = last_questions[0]
+    last_task_ui_updates = update_ui_for_selected_question(last_question, session_id)
+    return all_video_paths, *load_question_page(session_id, last_page, last_question), *last_task_ui_updates
 
 # --- Gradio UI ---
 with gr.Blocks(theme=gr.themes.Soft()) as demo:
-    tasks_state = gr.State({})
+    # 任務資料保存在伺服器端的 SQLite 資料庫中，UI 只保留 session id (並保存在瀏覽器中，重新整理頁面後自動恢復)
+    saved_session_id = gr.BrowserState("", storage_key="os_hw_toolchain_session_id")
 
     gr.Markdown("# 🔹 製作作業系統作業的系統作業程序 (多任務版)")
     
@@ -258,6 +312,13 @@ with gr.Blocks(theme=gr.themes.Soft()) as demo:
                 gr.Markdown("### 0. 任務管理")
                 question_input = gr.Textbox(label="請輸入所有問題 (以空白行分隔)", lines=10, placeholder="例如：\n1. CPU 和 GPU 的差別是什麼？\n\n2. 什麼是 RAM？")
                 parse_questions_btn = gr.Button("解析並載入問題", variant="secondary")
+                with gr.Row():
+                    session_id = gr.Textbox(label="工作階段 ID (會自動保存在瀏覽器中，也可貼上其他 ID 以恢復進度)", scale=3)
+                    restore_session_btn = gr.Button("恢復工作階段", variant="secondary", scale=1)
+                with gr.Row():
+                    prev_page_btn = gr.Button("◀ 上一頁", variant="secondary", scale=1)
+                    page_number = gr.Number(value=1, precision=0, minimum=1, label="頁碼", scale=2)
+                    next_page_btn = gr.Button("下一頁 ▶", variant="secondary", scale=1)
                 question_selector = gr.Dropdown(label="選擇要檢視/編輯的任務", interactive=True)
 
             with gr.Group():
@@ -290,6 +351,10 @@ with gr.Blocks(theme=gr.themes.Soft()) as demo:
                     with gr.Row():
                         font_size = gr.Slider(minimum=20, maximum=100, value=40, step=1, label="字體大小")
                         font_color = gr.ColorPicker(value="#ffffff", label="字體顏色")
+                    with gr.Row():
+                        encode_profile = gr.Dropdown(choices=[("預覽 (最快)", "preview"), ("標準", "standard"), ("封存 (高畫質)", "archive"), ("自動調校", "auto")], value=DEFAULT_ENCODE_PROFILE, label="編碼設定檔 (自動調校未設定目標時使用標準設定)")
+                        target_encode_speed = gr.Number(value=0, minimum=0, label="[自動調校] 目標編碼倍速 (0 表示不限)")
+                        target_mb_per_minute = gr.Number(value=0, minimum=0, label="[自動調校] 每分鐘檔案大小上限 MB (0 表示不限)")
                 generate_video_btn = gr.Button("僅合成此任務的影片", variant="secondary")
 
         with gr.Column(scale=1):
@@ -303,45 +368,71 @@ with gr.Blocks(theme=gr.themes.Soft()) as demo:
     # 0. Load and parse questions
     parse_questions_btn.click(
         fn=parse_and_load_questions, inputs=[question_input],
-        outputs=[tasks_state, question_selector, script_output, audio_output, image_prompt_output, background_image_upload, output_video_preview]
+        outputs=[session_id, page_number, question_selector, script_output, audio_output, image_prompt_output, background_image_upload, output_video_preview]
+    ).success(fn=lambda sid: sid, inputs=[session_id], outputs=[saved_session_id])
+
+    # Restore a previous session from the task store
+    restore_session_btn.click(
+        fn=restore_session, inputs=[session_id],
+        outputs=[session_id, page_number, question_selector, script_output, audio_output, image_prompt_output, background_image_upload, output_video_preview]
+    ).success(fn=lambda sid: sid, inputs=[session_id], outputs=[saved_session_id])
+
+    # Restore the session saved in the browser after a page reload
+    demo.load(
+        fn=restore_saved_session, inputs=[saved_session_id],
+        outputs=[session_id, page_number, question_selector, script_output, audio_output, image_prompt_output, background_image_upload, output_video_preview]
+    )
+
+    # Page through the task list
+    prev_page_btn.click(
+        fn=lambda sid, page: load_question_page(sid, (page or 1) - 1), inputs=[session_id, page_number],
+        outputs=[page_number, question_selector]
+    )
+    next_page_btn.click(
+        fn=lambda sid, page: load_question_page(sid, (page or 1) + 1), inputs=[session_id, page_number],
+        outputs=[page_number, question_selector]
+    )
+    page_number.submit(
+        fn=load_question_page, inputs=[session_id, page_number],
+        outputs=[page_number, question_selector]
     )
     
     # Update UI when dropdown changes
     question_selector.change(
-        fn=update_ui_for_selected_question, inputs=[question_selector, tasks_state],
+        fn=update_ui_for_selected_question, inputs=[question_selector, session_id],
         outputs=[script_output, audio_output, image_prompt_output, background_image_upload, output_video_preview]
     )
     
     # 1. Single Step: Generate Script
     generate_script_btn.click(
-        fn=run_single_script_step, inputs=[question_selector, tasks_state, script_language],
-        outputs=[tasks_state, script_output]
+        fn=run_single_script_step, inputs=[question_selector, session_id, script_language, tts_voice],
+        outputs=[script_output]
     )
     
     # 2. Single Step: Generate Audio
     generate_audio_btn.click(
-        fn=run_single_audio_step, inputs=[question_selector, tasks_state, script_output, tts_voice],
-        outputs=[tasks_state, audio_output]
+        fn=run_single_audio_step, inputs=[question_selector, session_id, script_output, tts_voice, script_language],
+        outputs=[audio_output]
     )
 
     # 3. Single Step: Generate Image
     generate_image_btn.click(
-        fn=run_single_image_step, inputs=[question_selector, tasks_state, script_output, video_width, video_height],
-        outputs=[tasks_state, image_prompt_output, background_image_upload]
+        fn=run_single_image_step, inputs=[question_selector, session_id, script_output, video_width, video_height],
+        outputs=[image_prompt_output, background_image_upload]
     )
 
     # 4. Single Step: Generate Video
     generate_video_btn.click(
         fn=run_single_video_step, 
-        inputs=[question_selector, tasks_state, background_image_upload, video_width, video_height, font_size, font_color, output_filename_prefix],
-        outputs=[tasks_state, output_video_preview]
+        inputs=[question_selector, session_id, background_image_upload, video_width, video_height, font_size, font_color, output_filename_prefix, encode_profile, target_encode_speed, target_mb_per_minute],
+        outputs=[output_video_preview]
     )
     
     # Run All Pipeline
     process_all_btn.click(
         fn=process_all_tasks,
-        inputs=[tasks_state, script_language, tts_voice, video_width, video_height, use_ai_image_for_all, background_image_upload, font_size, font_color, output_filename_prefix],
-        outputs=[tasks_state, output_files, question_selector, script_output, audio_output, image_prompt_output, background_image_upload, output_video_preview]
+        inputs=[session_id, script_language, tts_voice, video_width, video_height, use_ai_image_for_all, background_image_upload, font_size, font_color, output_filename_prefix, encode_profile, target_encode_speed, target_mb_per_minute],
+        outputs=[output_files, page_number, question_selector, script_output, audio_output, image_prompt_output, background_image_upload, output_video_preview]
     )
 
 if __name__ == "__main__":
@@ -9,10 +9,30 @@ load_dotenv()
 VIDEO_WIDTH = 1280
 VIDEO_HEIGHT = 720
 VIDEO_FPS = 30
+
+# x264/AAC 編碼設定檔 (keyint 為關鍵影格間隔的影格數)
+# standard 等同於原本 ffmpeg 的預設值 (preset medium、CRF 23)
+ENCODE_PROFILES = {
+    "preview": {"preset": "ultrafast", "crf": 30, "keyint": 600, "audio_bitrate": "96k"},
+    "standard": {"preset": "medium", "crf": 23, "keyint": 250, "audio_bitrate": "192k"},
+    "archive": {"preset": "slow", "crf": 18, "keyint": 250, "audio_bitrate": "256k"},
+}
+DEFAULT_ENCODE_PROFILE = "standard"
+ENCODER_TUNING_CACHE_PATH = "output/encoder_tuning.json" # 自動調校的量測結果 (依主機與解析度快取)
 OUTPUT_DIR = "output/videos"
 TEMP_DIR = "output/audio"
 IMAGE_DIR = "output/images" # 新增圖片輸出目錄
 
+# 任務資料庫設定 (SQLite，伺服器端保存每個工作階段的任務)
+TASK_DB_PATH = "output/tasks.db"
+TASK_PAGE_SIZE = 50 # 任務下拉選單每頁顯示的問題數
+TASK_RETENTION_DAYS = 7 # 超過此天數未使用的工作階段會在建立新工作階段時被清除
+
+# 演講稿長度設定 (秒)，在呼叫 TTS 之前依估計的朗讀長度控制講稿長短
+SCRIPT_MIN_SECONDS = 30
+SCRIPT_MAX_SECONDS = 60
+TTS_CALIBRATION_PATH = "output/tts_calibration.json" # 依語言與人聲校正的語速資料
+
 # 背景圖路徑
 DEFAULT_BG_IMAGE = "assets/images/bg_default.jpg"
 
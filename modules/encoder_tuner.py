@@ -0,0 +1,231 @@
+# modules/encoder_tuner.py
+import json
+import math
+import os
+import socket
+import subprocess
+import tempfile
+import threading
+import time
+from config import ENCODE_PROFILES, ENCODER_TUNING_CACHE_PATH, DEFAULT_BG_IMAGE, DEFAULT_ENCODE_PROFILE
+
+# 校正時量測的 x264 preset (由快到慢)，每個 preset 只在 CALIBRATION_CRF 編碼
+CALIBRATION_PRESETS = ["ultrafast", "veryfast", "fast", "medium"]
+CALIBRATION_CRF = 23
+# 可選的 CRF (由高畫質到低畫質)。其他 CRF 的位元率依 x264 的經驗法則推算：CRF 每增加 6，位元率約減半
+CANDIDATE_CRFS = [18, 23, 28]
+# 可選的關鍵影格間隔 (影格數，由短到長)。影片是靜止的背景圖，P 影格幾乎都是 skip，
+# 檔案大小主要由 I 影格的數量決定；間隔越長檔案越小，但拖曳播放時的定位越粗略
+CANDIDATE_KEYINTS = [250, 600, 1500]
+# ffmpeg 以 -loop 1 讀取圖片時的預設影格率 (generate_video 沒有另外指定輸出影格率)
+STILL_IMAGE_FPS = 25
+# 校正片段的影格數。每個 preset 會編碼一次只有 1 個 I 影格的片段，以及一次只有 1 個影格的基準片段，
+# 兩者相減即可分離出 I 影格與 P 影格的大小，以及扣除 ffmpeg 啟動與圖片解碼之後的每影格編碼時間
+CALIBRATION_FRAMES = 250
+# 自動調校可選的音訊位元率 (kbps)，由高到低
+AUDIO_BITRATES_KBPS = [192, 128, 96, 64]
+# 量測結果中必須存在的欄位，舊格式的快取會被重新量測
+_MEASUREMENT_FIELDS = ("i_frame_bytes", "p_frame_bytes", "p_frame_seconds")
+
+# 校正以「主機 + 解析度」為單位各自加鎖，同一組合只會校正一次，不同組合互不等待
+_KEY_LOCKS = {}
+_KEY_LOCKS_GUARD = threading.Lock()
+# 快取檔案的讀寫鎖 (只在讀寫 JSON 時短暫持有)
+_CACHE_LOCK = threading.Lock()
+
+def _cache_key(width: int, height: int) -> str:
+    return f"{socket.gethostname()}|{width}x{height}"
+
+def _key_lock(key: str) -> threading.Lock:
+    with _KEY_LOCKS_GUARD:
+        return _KEY_LOCKS.setdefault(key, threading.Lock())
+
+def _load_cache() -> dict:
+    try:
+        with open(ENCODER_TUNING_CACHE_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def _save_cache(cache: dict):
+    cache_dir = os.path.dirname(ENCODER_TUNING_CACHE_PATH)
+    if cache_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+    tmp_path = f"{ENCODER_TUNING_CACHE_PATH}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(cache, f, indent=2)
+    os.replace(tmp_path, ENCODER_TUNING_CACHE_PATH)
+
+def _timed_encode(preset: str, frames: int, width: int, height: int, bg_image_path: str, output_path: str) -> tuple[float, int]:
+    """編碼指定影格數的靜態背景影片 (只有第一個影格是 I 影格)，回傳 (耗時秒數, 檔案位元組數)。"""
+    cmd = [
+        "ffmpeg",
+        "-y",
+        "-loglevel", "error",
+        "-loop", "1",
+        "-i", bg_image_path,
+        "-frames:v", str(frames),
+        "-vf", f"scale={width}:{height}",
+        "-c:v", "libx264",
+        "-tune", "stillimage",
+        "-preset", preset,
+        "-crf", str(CALIBRATION_CRF),
+        "-g", str(frames),
+        "-pix_fmt", "yuv420p",
+        "-an",
+        output_path
+    ]
+    start = time.perf_counter()
+    subprocess.run(cmd, check=True)
+    elapsed = time.perf_counter() - start
+    return elapsed, os.path.getsize(output_path)
+
+def _calibration_encode(preset: str, width: int, height: int, bg_image_path: str) -> dict:
+    """
+    以指定的 preset 與 CALIBRATION_CRF 編碼校正片段，量測 I/P 影格大小與每個 P 影格的編碼時間。
+
+    Returns:
+        dict: {"i_frame_bytes": I 影格大小, "p_frame_bytes": 平均 P 影格大小, "p_frame_seconds": 每個 P 影格的編碼時間}
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        output_path = os.path.join(tmp_dir, "calibration.mp4")
+        base_seconds, base_bytes = _timed_encode(preset, 1, width, height, bg_image_path, output_path)
+        clip_seconds, clip_bytes = _timed_encode(preset, CALIBRATION_FRAMES, width, height, bg_image_path, output_path)
+    p_frames = CALIBRATION_FRAMES - 1
+    return {
+        "i_frame_bytes": base_bytes,
+        "p_frame_bytes": max(clip_bytes - base_bytes, 0) / p_frames,
+        "p_frame_seconds": max(clip_seconds - base_seconds, 1e-6) / p_frames
+    }
+
+def calibrate(width: int, height: int, bg_image_path: str = DEFAULT_BG_IMAGE, force: bool = False) -> dict:
+    """
+    在本機對每個 preset 執行短的校正編碼，結果依主機名稱與解析度快取。
+
+    Args:
+        width (int): 影片寬度。
+        height (int): 影片高度。
+        bg_image_path (str, optional): 校正時使用的背景圖片。預設為 DEFAULT_BG_IMAGE。
+        force (bool, optional): 忽略快取並重新量測。預設為 False。
+
+    Returns:
+        dict: 以 preset 為鍵、在 CALIBRATION_CRF 下的量測結果。
+    """
+    key = _cache_key(width, height)
+    with _key_lock(key):
+        with _CACHE_LOCK:
+            cached = _load_cache().get(key)
+        is_complete = cached and all(
+            all(field in cached.get(preset, {}) for field in _MEASUREMENT_FIELDS)
+            for preset in CALIBRATION_PRESETS
+        )
+        if is_complete and not force:
+            return cached
+
+        print(f"[ENCODER] 正在為 {key} 執行編碼校正，這只需要執行一次...")
+        measurements = {
+            preset: _calibration_encode(preset, width, height, bg_image_path)
+            for preset in CALIBRATION_PRESETS
+        }
+        with _CACHE_LOCK:
+            cache = _load_cache()
+            cache[key] = measurements
+            _save_cache(cache)
+        print("[ENCODER] 編碼校正完成。")
+        return measurements
+
+def _estimate(measurements: dict, preset: str, crf: int, keyint: int) -> dict:
+    """
+    由 CALIBRATION_CRF 的量測結果推算指定 CRF 與關鍵影格間隔的編碼速度與視訊位元率。
+    位元率 = I 影格大小 × 每秒 I 影格數 + P 影格大小 × 每秒 P 影格數；
+    每秒 I 影格數以一分鐘的影片計算 (與 target_mb_per_minute 的單位一致)。
+    """
+    result = measurements[preset]
+    crf_scale = 2 ** ((CALIBRATION_CRF - crf) / 6)
+    keyframes_per_second = math.ceil(60 * STILL_IMAGE_FPS / keyint) / 60
+    bytes_per_second = (
+        result["i_frame_bytes"] * keyframes_per_second
+        + result["p_frame_bytes"] * (STILL_IMAGE_FPS - keyframes_per_second)
+    ) * crf_scale
+    return {
+        "speed": 1 / (result["p_frame_seconds"] * STILL_IMAGE_FPS),
+        "video_kbps": bytes_per_second * 8 / 1000
+    }
+
+def auto_tune(width: int, height: int, target_speed: float | None = None, target_mb_per_minute: float | None = None) -> dict:
+    """
+    依照本機的校正結果挑選符合目標編碼速度或檔案大小、且畫質最好的 preset、CRF、關鍵影格間隔與音訊位元率。
+
+    Args:
+        width (int): 影片寬度。
+        height (int): 影片高度。
+        target_speed (float | None, optional): 最低編碼倍速 (相對於即時)，None 表示不限制。
+        target_mb_per_minute (float | None, optional): 每分鐘影片的最大檔案大小 (MB)，None 表示不限制。
+
+    Returns:
+        dict: 與 ENCODE_PROFILES 相同格式的編碼設定。沒有設定任何目標時直接回傳 DEFAULT_ENCODE_PROFILE (不執行校正)。
+        若沒有組合能符合目標：檔案大小無法達成時回傳推算位元率最低的組合與最低音訊位元率；
+        只有編碼速度無法達成時回傳量測到速度最快的組合。
+    """
+    if not target_speed and not target_mb_per_minute:
+        return ENCODE_PROFILES[DEFAULT_ENCODE_PROFILE]
+
+    measurements = calibrate(width, height)
+    budget_kbps = target_mb_per_minute * 8000 / 60 if target_mb_per_minute else None
+    candidates = [
+        (preset, crf, keyint)
+        for crf in CANDIDATE_CRFS
+        for preset in reversed(CALIBRATION_PRESETS)
+        for keyint in CANDIDATE_KEYINTS
+    ]
+
+    def settings(preset, crf, keyint, audio_kbps):
+        return {"preset": preset, "crf": crf, "keyint": keyint, "audio_bitrate": f"{audio_kbps}k"}
+
+    def fits_speed(preset, crf, keyint):
+        return not target_speed or _estimate(measurements, preset, crf, keyint)["speed"] >= target_speed
+
+    def fits_size(preset, crf, keyint, audio_kbps):
+        return not budget_kbps or _estimate(measurements, preset, crf, keyint)["video_kbps"] + audio_kbps <= budget_kbps
+
+    # 優先保留音質 (旁白是影片的主要內容)，其次是較低的 CRF、較慢 (壓縮率較高) 的 preset，
+    # 最後才是較長的關鍵影格間隔 (只在需要壓低檔案大小時才犧牲定位精細度)
+    for audio_kbps in AUDIO_BITRATES_KBPS:
+        for candidate in candidates:
+            if fits_speed(*candidate) and fits_size(*candidate, audio_kbps):
+                return settings(*candidate, audio_kbps)
+
+    lowest_audio_kbps = AUDIO_BITRATES_KBPS[-1]
+    if budget_kbps and not any(fits_size(*candidate, lowest_audio_kbps) for candidate in candidates):
+        print("[ENCODER] 沒有任何編碼設定能符合檔案大小目標，改用位元率最低的設定。")
+        candidate = min(candidates, key=lambda c: _estimate(measurements, *c)["video_kbps"])
+        return settings(*candidate, lowest_audio_kbps)
+
+    print("[ENCODER] 沒有任何編碼設定能符合編碼速度目標，改用速度最快的設定。")
+    fastest = max(_estimate(measurements, *c)["speed"] for c in candidates)
+    fastest_candidates = [c for c in candidates if _estimate(measurements, *c)["speed"] == fastest]
+    for audio_kbps in AUDIO_BITRATES_KBPS:
+        for candidate in fastest_candidates:
+            if fits_size(*candidate, audio_kbps):
+                return settings(*candidate, audio_kbps)
+    return settings(*fastest_candidates[-1], lowest_audio_kbps)
+
+def resolve_encode_profile(profile_name: str, width: int, height: int, target_speed: float | None = None, target_mb_per_minute: float | None = None) -> dict:
+    """
+    將編碼設定檔名稱轉換為實際的編碼設定。
+
+    Args:
+        profile_name (str): ENCODE_PROFILES 中的名稱，或 "auto" 表示自動調校。
+        width (int): 影片寬度。
+        height (int): 影片高度。
+        target_speed (float | None, optional): 自動調校的最低編碼倍速。
+        target_mb_per_minute (float | None, optional): 自動調校的每分鐘檔案大小上限 (MB)。
+
+    Returns:
+        dict: 包含 preset、crf、keyint 與 audio_bitrate 的編碼設定。
+    """
+    if profile_name == "auto":
+        return auto_tune(width, height, target_speed, target_mb_per_minute)
+    if profile_name not in ENCODE_PROFILES:
+        raise ValueError(f"未知的編碼設定檔: {profile_name}")
+    return ENCODE_PROFILES[profile_name]
@@ -1,6 +1,8 @@
 import torch
 from transformers import pipeline, BitsAndBytesConfig
 import os
+from modules.speech_duration import estimate_duration, max_new_tokens_for, target_units, trim_to_duration, unit_name
+from config import SCRIPT_MIN_SECONDS, SCRIPT_MAX_SECONDS
 
 LLM_PIPELINE = None
 
@@ -29,7 +31,7 @@ def _initialize_llm():
         )
         print("Llama-8B 模型載入完成。")
 
-def _query_llama(prompt_text: str) -> str:
+def _query_llama(prompt_text: str, max_new_tokens: int = 1024) -> str:
     """使用本地 Llama 模型生成回應。"""
     if LLM_PIPELINE is None:
         _initialize_llm()
@@ -40,7 +42,7 @@ def _query_llama(prompt_text: str) -> str:
     
     outputs = LLM_PIPELINE(
         messages,
-        max_new_tokens=1024, # 增加 token 數量以容納腳本
+        max_new_tokens=max_new_tokens,
         do_sample=True,
         temperature=0.7,
         top_p=0.9,
@@ -57,21 +59,59 @@ def _query_llama(prompt_text: str) -> str:
     return ""
 
 
-def generate_script(question: str, language: str = "English") -> str:
+def _fit_script_length(script: str, language: str, voice: str) -> str:
+    """
+    在呼叫 TTS 之前檢查講稿的估計朗讀長度，若超出目標範圍則請 LLM 縮短或擴寫一次；
+    調整後仍過長 (或被 max_new_tokens 截斷) 時，再於句子邊界修剪到 SCRIPT_MAX_SECONDS 以內。
+
+    :param script: The generated script
+    :param language: The language of the script
+    :param voice: The TTS voice that will read the script
+    :return: The script, adjusted to the target duration window when needed
+    """
+    duration = estimate_duration(script, language, voice)
+    if SCRIPT_MIN_SECONDS <= duration <= SCRIPT_MAX_SECONDS:
+        return script
+
+    action = "Shorten" if duration > SCRIPT_MAX_SECONDS else "Expand"
+    target = target_units((SCRIPT_MIN_SECONDS + SCRIPT_MAX_SECONDS) / 2, language, voice)
+    print(f"[SCRIPT] 估計朗讀長度 {duration:.0f} 秒，超出 {SCRIPT_MIN_SECONDS}-{SCRIPT_MAX_SECONDS} 秒範圍，正在調整長度...")
+    prompt = f"""
+    {action} the following conversational script to about {target} {unit_name(language)}.
+    Keep the same language ({language}), meaning and conversational tone.
+    Your output MUST be only the script text itself, without any additional explanations, titles, or formatting.
+
+    Script:
+    {script}
+    """
+    adjusted = _query_llama(prompt, max_new_tokens=max_new_tokens_for(SCRIPT_MAX_SECONDS, language, voice))
+    if not adjusted.strip() or (action == "Expand" and estimate_duration(adjusted, language, voice) < duration):
+        adjusted = script
+
+    duration = estimate_duration(adjusted, language, voice)
+    if duration > SCRIPT_MAX_SECONDS:
+        print(f"[SCRIPT] 調整後仍約 {duration:.0f} 秒，於句子邊界修剪至 {SCRIPT_MAX_SECONDS} 秒以內。")
+        adjusted = trim_to_duration(adjusted, SCRIPT_MAX_SECONDS, language, voice)
+    return adjusted
+
+def generate_script(question: str, language: str = "English", voice: str = "Kore") -> str:
     """
     Generate a conversational script for a video presentation directly from a question.
-    The script will be between approximately 30 seconds and 1 minute long.
+    The script length is controlled with a speech-duration estimate calibrated for the
+    language and TTS voice, so it reads aloud in SCRIPT_MIN_SECONDS to SCRIPT_MAX_SECONDS.
 
     :param question: The user's original input question
     :param language: The language for the output script
+    :param voice: The TTS voice that will read the script
     :return: The generated conversational script
     """
+    target = target_units((SCRIPT_MIN_SECONDS + SCRIPT_MAX_SECONDS) / 2, language, voice)
     prompt = f"""
     Your task is to generate a conversational script for a video presentation based on the following question.
     First, formulate a clear and concise answer to the question.
     Then, based on your answer, create the script.
     The script should be in {language}.
-    The script should be between 30 seconds and 1 minute long.
+    The script should be between {SCRIPT_MIN_SECONDS} seconds and {SCRIPT_MAX_SECONDS} seconds long when read aloud, which is about {target} {unit_name(language)}.
     Use simple, easy-to-understand language and avoid technical jargon.
     IMPORTANT: Do not repeat the question in your opening. Start directly with the answer in a conversational way.
     Your output MUST be only the script text itself, without any additional explanations, titles, or formatting like "Scenario Description:" or "Script:".
@@ -79,7 +119,8 @@ def generate_script(question: str, language: str = "English") -> str:
     Question:
     {question}
     """
-    return _query_llama(prompt)
+    script = _query_llama(prompt, max_new_tokens=max_new_tokens_for(SCRIPT_MAX_SECONDS, language, voice))
+    return _fit_script_length(script, language, voice)
 
 def generate_image_prompt(question: str, script_text: str) -> str:
     """
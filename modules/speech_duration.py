@@ -0,0 +1,188 @@
+# modules/speech_duration.py
+import json
+import os
+import re
+import threading
+import wave
+from config import TTS_CALIBRATION_PATH
+
+# 各語言的預設語速 (每秒的語音單位數) 與每個單位大約對應的 LLM token 數。
+# 英文以「單字」為單位；中文與日文以「字元」為單位 (夾雜的英文單字各算一個單位)。
+# 預設值只是起點，實際語速會依照過去 TTS 輸出的長度逐步校正。
+LANGUAGE_PROFILES = {
+    "English": {"units_per_second": 2.5, "tokens_per_unit": 1.4, "unit_name": "words"},
+    "Traditional Chinese": {"units_per_second": 4.0, "tokens_per_unit": 1.3, "unit_name": "characters"},
+    "Japanese": {"units_per_second": 6.5, "tokens_per_unit": 1.1, "unit_name": "characters"},
+}
+DEFAULT_PROFILE = LANGUAGE_PROFILES["English"]
+
+# 預設語速在校正中所佔的權重 (相當於幾秒的樣本)，避免少量樣本讓估計值劇烈跳動
+PRIOR_WEIGHT_SECONDS = 60.0
+
+_CJK_CHAR = re.compile(r"[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]")
+_WORD = re.compile(r"[A-Za-z0-9]+(?:['’-][A-Za-z0-9]+)*")
+_KANA = re.compile(r"[\u3040-\u30ff]")
+# 句子結尾 (含緊接的引號或括號)，用於在句子邊界修剪講稿
+_SENTENCE = re.compile(r".+?(?:[.!?。！？…]+[\"'」』）)]*(?=\s|$)|[。！？]+[」』）]*|$)", re.S)
+# 子句結尾，當單一句子就超出長度時改在子句邊界修剪
+_CLAUSE = re.compile(r".+?(?:[，、,;；：:]+\s*|$)", re.S)
+# 單一語音單位 (CJK 字元或英文單字)，作為最後的修剪邊界
+_UNIT = re.compile(f"{_CJK_CHAR.pattern}|{_WORD.pattern}")
+
+_LOCK = threading.Lock()
+_CALIBRATION = None
+
+def _profile(language: str) -> dict:
+    return LANGUAGE_PROFILES.get(language, DEFAULT_PROFILE)
+
+def unit_name(language: str) -> str:
+    """回傳該語言在提示詞中描述長度所用的單位 (words 或 characters)。"""
+    return _profile(language)["unit_name"]
+
+def _calibration_key(language: str, voice: str) -> str:
+    return f"{language}|{voice}"
+
+def _load_calibration() -> dict:
+    """讀取 (並快取) 校正資料。呼叫前需持有 _LOCK。"""
+    global _CALIBRATION
+    if _CALIBRATION is None:
+        try:
+            with open(TTS_CALIBRATION_PATH, "r", encoding="utf-8") as f:
+                _CALIBRATION = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            _CALIBRATION = {}
+    return _CALIBRATION
+
+def count_speech_units(text: str) -> int:
+    """
+    計算文字中的語音單位數。
+
+    Args:
+        text (str): 演講稿文字。
+
+    Returns:
+        int: 英文為單字數；中文/日文為 CJK 字元數加上夾雜的英文單字數。
+    """
+    if not text:
+        return 0
+    cjk_chars = len(_CJK_CHAR.findall(text))
+    words = len(_WORD.findall(_CJK_CHAR.sub(" ", text)))
+    return cjk_chars + words
+
+def matches_language(text: str, language: str) -> bool:
+    """
+    檢查文字的字元組成是否符合指定語言，避免語言不符的樣本污染語速校正。
+    英文應幾乎沒有 CJK 字元；中文與日文應以 CJK 字元為主，並以假名比例區分兩者。
+    """
+    units = count_speech_units(text)
+    if not units:
+        return False
+    cjk_chars = len(_CJK_CHAR.findall(text))
+    kana_chars = len(_KANA.findall(text))
+    cjk_ratio = cjk_chars / units
+    if language == "English":
+        return cjk_ratio < 0.1
+    if language == "Traditional Chinese":
+        return cjk_ratio >= 0.5 and kana_chars / cjk_chars < 0.05
+    if language == "Japanese":
+        return cjk_ratio >= 0.5 and kana_chars / cjk_chars >= 0.1
+    return True
+
+def speaking_rate(language: str, voice: str) -> float:
+    """回傳指定語言與人聲的語速 (每秒語音單位數)，已套用過去 TTS 輸出的校正。"""
+    prior_rate = _profile(language)["units_per_second"]
+    with _LOCK:
+        sample = _load_calibration().get(_calibration_key(language, voice))
+    if not sample:
+        return prior_rate
+    units = sample["units"] + prior_rate * PRIOR_WEIGHT_SECONDS
+    seconds = sample["seconds"] + PRIOR_WEIGHT_SECONDS
+    return units / seconds
+
+def estimate_duration(text: str, language: str, voice: str) -> float:
+    """估計文字經 TTS 朗讀後的長度 (秒)。"""
+    return count_speech_units(text) / speaking_rate(language, voice)
+
+def target_units(seconds: float, language: str, voice: str) -> int:
+    """回傳朗讀指定秒數所需的語音單位數。"""
+    return round(seconds * speaking_rate(language, voice))
+
+def _cut_units(text: str, units: int) -> str:
+    """在第 units 個語音單位 (單字或字元) 之後截斷文字。"""
+    matches = list(_UNIT.finditer(text))
+    if units <= 0 or not matches:
+        return ""
+    return text[:matches[min(units, len(matches)) - 1].end()]
+
+def trim_to_duration(text: str, max_seconds: float, language: str, voice: str) -> str:
+    """
+    修剪文字，使估計朗讀長度不超過 max_seconds。這是不需呼叫 LLM 的低成本修剪。
+    優先在句子邊界修剪；若保留的句子不到長度的一半 (例如第一句就超出長度，或整段沒有句號)，
+    再從超出的那一句中依子句邊界補上，仍放不下時在單字/字元邊界截斷。
+    """
+    budget = target_units(max_seconds, language, voice)
+    text = text.strip()
+    if count_speech_units(text) <= budget:
+        return text
+
+    kept = ""
+    for match in _SENTENCE.finditer(text):
+        sentence = match.group(0)
+        if count_speech_units(kept + sentence) <= budget:
+            kept += sentence
+            continue
+        if count_speech_units(kept) < budget / 2:
+            part = ""
+            for clause in _CLAUSE.finditer(sentence):
+                if count_speech_units(kept + part + clause.group(0)) > budget:
+                    break
+                part += clause.group(0)
+            if not part.strip():
+                part = _cut_units(sentence, budget - count_speech_units(kept))
+            kept += part
+        break
+    return kept.strip()
+
+def max_new_tokens_for(seconds: float, language: str, voice: str) -> int:
+    """
+    依照目標長度估算 LLM 生成所需的 max_new_tokens。
+    保留約 30% 的餘裕與固定的 64 個 token，避免講稿在句子中間被截斷。
+    """
+    tokens = target_units(seconds, language, voice) * _profile(language)["tokens_per_unit"]
+    return int(tokens * 1.3) + 64
+
+def record_tts_output(text: str, language: str, voice: str, audio_path: str):
+    """
+    以實際的 TTS 輸出長度更新該語言與人聲的語速校正資料。
+
+    Args:
+        text (str): 送入 TTS 的文字。
+        language (str): 文字的語言。
+        voice (str): TTS 使用的人聲。
+        audio_path (str): TTS 產生的 WAV 檔案路徑。
+    """
+    units = count_speech_units(text)
+    if not units or not os.path.exists(audio_path):
+        return
+    if not matches_language(text, language):
+        print(f"[AUDIO] 文字內容與語言 '{language}' 不符，略過語速校正。")
+        return
+    with wave.open(audio_path, "rb") as wf:
+        seconds = wf.getnframes() / float(wf.getframerate())
+    if seconds <= 0:
+        return
+
+    with _LOCK:
+        calibration = _load_calibration()
+        sample = calibration.setdefault(_calibration_key(language, voice), {"units": 0, "seconds": 0.0, "samples": 0})
+        sample["units"] += units
+        sample["seconds"] += seconds
+        sample["samples"] += 1
+
+        cal_dir = os.path.dirname(TTS_CALIBRATION_PATH)
+        if cal_dir:
+            os.makedirs(cal_dir, exist_ok=True)
+        tmp_path = f"{TTS_CALIBRATION_PATH}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(calibration, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, TTS_CALIBRATION_PATH)
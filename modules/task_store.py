@@ -0,0 +1,157 @@
+# modules/task_store.py
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from config import TASK_DB_PATH, TASK_RETENTION_DAYS
+
+# 每個任務可被更新的欄位 (對應原本 tasks_state 中每題的 dict)
+TASK_FIELDS = ("script", "audio_path", "image_prompt", "bg_image_path", "video_path")
+
+_LOCAL = threading.local()
+
+def _get_connection():
+    """
+    取得目前執行緒專用的 SQLite 連線。
+    Gradio 會在不同的工作執行緒中呼叫事件處理函式，因此每個執行緒各自持有一條連線，
+    並使用 WAL 模式讓讀取與寫入可以同時進行。
+    """
+    conn = getattr(_LOCAL, "conn", None)
+    if conn is None:
+        db_dir = os.path.dirname(TASK_DB_PATH)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        conn = sqlite3.connect(TASK_DB_PATH, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS tasks (
+                session_id    TEXT    NOT NULL,
+                position      INTEGER NOT NULL,
+                question      TEXT    NOT NULL,
+                script        TEXT    NOT NULL DEFAULT '',
+                audio_path    TEXT,
+                image_prompt  TEXT    NOT NULL DEFAULT '',
+                bg_image_path TEXT,
+                video_path    TEXT,
+                created_at    REAL    NOT NULL DEFAULT 0,
+                last_access   REAL    NOT NULL DEFAULT 0,
+                PRIMARY KEY (session_id, position)
+            )
+        """)
+        # 舊版資料庫沒有 created_at / last_access 欄位，補上後以建立時間作為最後使用時間
+        columns = {row["name"] for row in conn.execute("PRAGMA table_info(tasks)")}
+        if "created_at" not in columns:
+            conn.execute("ALTER TABLE tasks ADD COLUMN created_at REAL NOT NULL DEFAULT 0")
+        if "last_access" not in columns:
+            conn.execute("ALTER TABLE tasks ADD COLUMN last_access REAL NOT NULL DEFAULT 0")
+            conn.execute("UPDATE tasks SET last_access = created_at")
+        conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_tasks_session_question ON tasks (session_id, question)")
+        conn.execute("DROP INDEX IF EXISTS idx_tasks_created_at")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_session_last_access ON tasks (session_id, last_access)")
+        conn.commit()
+        _LOCAL.conn = conn
+    return conn
+
+def create_session(questions: list[str]) -> str:
+    """
+    建立新的工作階段並寫入所有問題，同時清除超過 TASK_RETENTION_DAYS 天未使用的舊工作階段。
+
+    Args:
+        questions (list[str]): 解析後的問題列表 (重複的問題只會保留第一個)。
+
+    Returns:
+        str: 新的 session id。
+    """
+    session_id = uuid.uuid4().hex
+    unique_questions = list(dict.fromkeys(questions))
+    now = time.time()
+    conn = _get_connection()
+    with conn:
+        # 只要工作階段中任一任務在保留期限內被讀寫過，整個工作階段都會保留
+        conn.execute(
+            """
+            DELETE FROM tasks WHERE session_id IN (
+                SELECT session_id FROM tasks GROUP BY session_id HAVING MAX(last_access) < ?
+            )
+            """,
+            (now - TASK_RETENTION_DAYS * 86400,)
+        )
+        conn.executemany(
+            "INSERT INTO tasks (session_id, position, question, created_at, last_access) VALUES (?, ?, ?, ?, ?)",
+            [(session_id, i, q, now, now) for i, q in enumerate(unique_questions)]
+        )
+    return session_id
+
+def count_tasks(session_id: str) -> int:
+    """回傳該工作階段的任務數量。"""
+    if not session_id:
+        return 0
+    row = _get_connection().execute(
+        "SELECT COUNT(*) FROM tasks WHERE session_id = ?", (session_id,)
+    ).fetchone()
+    return row[0]
+
+def list_questions(session_id: str, offset: int = 0, limit: int | None = None) -> list[str]:
+    """
+    依照輸入順序列出該工作階段的問題，可指定分頁範圍。
+
+    Args:
+        session_id (str): 工作階段 id。
+        offset (int, optional): 略過的筆數。預設為 0。
+        limit (int | None, optional): 最多回傳的筆數，None 表示全部。
+
+    Returns:
+        list[str]: 問題列表。
+    """
+    if not session_id:
+        return []
+    rows = _get_connection().execute(
+        "SELECT question FROM tasks WHERE session_id = ? ORDER BY position LIMIT ? OFFSET ?",
+        (session_id, -1 if limit is None else limit, offset)
+    ).fetchall()
+    return [row["question"] for row in rows]
+
+def get_task(session_id: str, question: str) -> dict | None:
+    """讀取單一任務的資料並更新其最後使用時間，找不到時回傳 None。"""
+    if not session_id or not question:
+        return None
+    conn = _get_connection()
+    row = conn.execute(
+        f"SELECT {', '.join(TASK_FIELDS)} FROM tasks WHERE session_id = ? AND question = ?",
+        (session_id, question)
+    ).fetchone()
+    if row is None:
+        return None
+    with conn:
+        conn.execute(
+            "UPDATE tasks SET last_access = ? WHERE session_id = ? AND question = ?",
+            (time.time(), session_id, question)
+        )
+    return dict(row)
+
+def update_task(session_id: str, question: str, **fields):
+    """
+    只更新單一任務中指定的欄位，並更新其最後使用時間。
+
+    Args:
+        session_id (str): 工作階段 id。
+        question (str): 任務對應的問題。
+        **fields: 要更新的欄位，必須是 TASK_FIELDS 之一。
+    """
+    unknown = set(fields) - set(TASK_FIELDS)
+    if unknown:
+        raise ValueError(f"未知的任務欄位: {', '.join(sorted(unknown))}")
+    if not fields:
+        return
+    assignments = ", ".join(f"{name} = ?" for name in fields)
+    conn = _get_connection()
+    with conn:
+        cursor = conn.execute(
+            f"UPDATE tasks SET {assignments}, last_access = ? WHERE session_id = ? AND question = ?",
+            (*fields.values(), time.time(), session_id, question)
+        )
+    if cursor.rowcount == 0:
+        raise KeyError(f"找不到任務: {question}")
@@ -2,7 +2,7 @@
 import os
 import subprocess
 import textwrap
-from config import VIDEO_WIDTH, VIDEO_HEIGHT, VIDEO_FPS, OUTPUT_DIR, DEFAULT_BG_IMAGE, FONT_PATH
+from config import VIDEO_WIDTH, VIDEO_HEIGHT, VIDEO_FPS, OUTPUT_DIR, DEFAULT_BG_IMAGE, FONT_PATH, ENCODE_PROFILES, DEFAULT_ENCODE_PROFILE
 
 def generate_video(
     audio_path,
@@ -12,7 +12,8 @@ def generate_video(
     width=VIDEO_WIDTH,
     height=VIDEO_HEIGHT,
     font_size=40,
-    font_color="white"
+    font_color="white",
+    encode_settings=ENCODE_PROFILES[DEFAULT_ENCODE_PROFILE]
 ):
     os.makedirs(OUTPUT_DIR, exist_ok=True)
     output_path = os.path.join(OUTPUT_DIR, output_name)
@@ -37,8 +38,11 @@ def generate_video(
         "-vf", f"scale={width}:{height},drawtext=text='{escaped_text}':fontfile={FONT_PATH}:fontcolor={font_color}:fontsize={font_size}:x=(w-text_w)/2:y=50:box=1:boxcolor=black@0.5:boxborderw=15",
         "-c:v", "libx264",
         "-tune", "stillimage",
+        "-preset", encode_settings["preset"],
+        "-crf", str(encode_settings["crf"]),
+        "-g", str(encode_settings["keyint"]),
         "-c:a", "aac",
-        "-b:a", "192k",
+        "-b:a", encode_settings["audio_bitrate"],
         "-pix_fmt", "yuv420p",
         "-shortest",
         output_path